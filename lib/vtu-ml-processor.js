@@ -44,9 +44,11 @@ import path from 'path';
 export class VTUMLProcessor {
   static instance;
   pythonPath;
+  serverUrl;
 
   constructor() {
     this.pythonPath = path.join(process.cwd(), 'models');
+    this.serverUrl = process.env.ML_SERVER_URL || 'http://127.0.0.1:8001';
   }
 
   static getInstance() {
@@ -105,9 +107,32 @@ export class VTUMLProcessor {
   }
 
   /**
-   * Call Python ML model via subprocess
+   * Call Python ML model via the persistent ML server, falling back to the CLI
    */
   async callPythonMLModel(question, context) {
+    try {
+      const response = await fetch(`${this.serverUrl}/process`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ question, context }),
+        signal: AbortSignal.timeout(10000)
+      });
+
+      if (!response.ok) {
+        throw new Error(`ML server responded with ${response.status}`);
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.log('⚠️ ML server unavailable, spawning Python CLI:', error.message);
+      return this.callPythonMLModelCLI(question, context);
+    }
+  }
+
+  /**
+   * Call Python ML model via subprocess
+   */
+  async callPythonMLModelCLI(question, context) {
     return new Promise((resolve, reject) => {
       const data = {
         question,
@@ -7,7 +7,12 @@ import sys
 import os
 import json
 import subprocess
-from typing import Dict, Any
+from typing import Dict, List, Any
+
+# Make vtu_ml_processor / ml_server importable (once, not per call)
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODELS_DIR not in sys.path:
+    sys.path.append(MODELS_DIR)
 
 def process_question_with_ml(question: str, context: Dict) -> Dict:
     """
@@ -16,7 +21,6 @@ def process_question_with_ml(question: str, context: Dict) -> Dict:
     """
     try:
         # Import ML processor
-        sys.path.append(os.path.dirname(__file__))
         from vtu_ml_processor import vtu_ml_processor
         
         # Process question
@@ -26,7 +30,34 @@ def process_question_with_ml(question: str, context: Dict) -> Dict:
             'success': True,
             'data': result,
             'model_info': {
-                'version': '1.0',
+                'version': '1.2',
+                'type': 'VTU Custom ML',
+                'accuracy': '89.3%'
+            }
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'fallback': 'Using basic processing'
+        }
+
+def process_questions_batch_with_ml(questions: List[str], contexts: List[Dict]) -> Dict:
+    """
+    Process a batch of questions using Python ML models
+    Called from the ML server's /process_batch route
+    """
+    try:
+        from vtu_ml_processor import vtu_ml_processor
+        
+        results = vtu_ml_processor.process_questions_batch(questions, contexts)
+        
+        return {
+            'success': True,
+            'data': results,
+            'model_info': {
+                'version': '1.2',
                 'type': 'VTU Custom ML',
                 'accuracy': '89.3%'
             }
@@ -42,7 +73,6 @@ def process_question_with_ml(question: str, context: Dict) -> Dict:
 def train_models():
     """Train ML models"""
     try:
-        sys.path.append(os.path.dirname(__file__))
         from vtu_ml_processor import vtu_ml_processor
         
         metrics = vtu_ml_processor.train_models()
@@ -58,11 +88,15 @@ def train_models():
         }
 
 if __name__ == "__main__":
+    # Before numpy/sklearn load their OpenMP runtime; an explicit value still wins
+    os.environ.setdefault('OMP_NUM_THREADS', str(os.cpu_count() or 1))
+    
     # Command line interface
     import argparse
     parser = argparse.ArgumentParser(description='VTU EduMate ML Processor')
     parser.add_argument('--train', action='store_true', help='Train ML models')
     parser.add_argument('--process', type=str, help='Process question JSON')
+    parser.add_argument('--serve', action='store_true', help='Start persistent ML server (see ml_server.py)')
     
     args = parser.parse_args()
     
@@ -73,3 +107,6 @@ if __name__ == "__main__":
         data = json.loads(args.process)
         result = process_question_with_ml(data['question'], data['context'])
         print(json.dumps(result, indent=2))
+    elif args.serve:
+        from ml_server import run
+        run()
@@ -0,0 +1,118 @@
+"""
+VTU EduMate ML Server
+Long-lived ML worker for the Next.js application
+
+Imports the VTU ML processor once and keeps the trained models in memory,
+so each request only pays for the transform + predict step instead of a
+fresh Python interpreter, sklearn import and model unpickling.
+
+Usage:
+    models/start_ml_server.sh  # Linux/macOS: preloads mimalloc/jemalloc with PYTHONMALLOC=malloc
+    uvicorn ml_server:app --app-dir models --host 127.0.0.1 --port 8001 --workers 1
+    python models/ml_server.py  # same, with the defaults below
+
+Environment Variables:
+    ML_SERVER_HOST: 127.0.0.1 (default)
+    ML_SERVER_PORT: 8001 (default)
+"""
+
+import sys
+import os
+from typing import Dict, List, Any
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+# Before numpy/sklearn load their OpenMP runtime; an explicit value still wins
+os.environ.setdefault('OMP_NUM_THREADS', str(os.cpu_count() or 1))
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODELS_DIR not in sys.path:
+    sys.path.append(MODELS_DIR)
+from vtu_ml_processor import vtu_ml_processor
+from ml_api import process_question_with_ml, process_questions_batch_with_ml
+
+# Configuration
+ML_SERVER_HOST = os.getenv('ML_SERVER_HOST', '127.0.0.1')
+ML_SERVER_PORT = int(os.getenv('ML_SERVER_PORT', '8001'))
+
+app = FastAPI(title='VTU EduMate ML Server')
+
+class ProcessRequest(BaseModel):
+    question: str
+    context: Dict[str, Any]
+
+class ProcessBatchRequest(BaseModel):
+    questions: List[str]
+    contexts: List[Dict[str, Any]]
+
+@app.on_event('startup')
+def warm_up():
+    """Load (or train) models once and pre-warm sklearn's lazy imports"""
+    print("🚀 Warming up VTU ML Server...")
+    if not vtu_ml_processor.load_models():
+        vtu_ml_processor.train_models()
+
+    # First transform pulls in scipy.sparse internals; do it at boot, not on the first query
+    vtu_ml_processor.vectorizer.transform([""])
+    print("✅ VTU ML Server ready!")
+
+@app.get('/health')
+def health() -> Dict:
+    return {'status': 'ok', 'models_loaded': vtu_ml_processor.complexity_model is not None}
+
+@app.get('/cache_stats')
+def cache_stats() -> Dict:
+    return vtu_ml_processor.cache_stats()
+
+@app.get('/allocator_stats')
+def allocator_stats() -> Dict:
+    """Which allocator this process runs on, plus memory usage"""
+    try:
+        import resource  # Unix only
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        max_rss_kb = None
+
+    preload = os.environ.get('LD_PRELOAD', '')
+    if 'mimalloc' in preload:
+        allocator = 'mimalloc'
+    elif 'jemalloc' in preload:
+        allocator = 'jemalloc'
+    elif os.environ.get('PYTHONMALLOC') == 'malloc':
+        allocator = 'system malloc'
+    else:
+        allocator = 'pymalloc'
+
+    return {
+        'allocator': allocator,
+        'ld_preload': preload or None,
+        'pythonmalloc': os.environ.get('PYTHONMALLOC'),
+        'allocated_blocks': sys.getallocatedblocks(),
+        'max_rss_kb': max_rss_kb
+    }
+
+@app.post('/process')
+def process(request: ProcessRequest) -> Dict:
+    """Same response shape as `ml_api.py --process`"""
+    return process_question_with_ml(request.question, request.context)
+
+@app.post('/process_batch')
+def process_batch(request: ProcessBatchRequest) -> Dict:
+    """Vectorize and predict all questions in one call; `data` is a list of /process results"""
+    return process_questions_batch_with_ml(request.questions, request.contexts)
+
+def run():
+    """Serve the app with a single worker (uvloop when installed, asyncio otherwise)"""
+    import uvicorn
+    uvicorn.run(
+        'ml_server:app',
+        app_dir=MODELS_DIR,
+        host=ML_SERVER_HOST,
+        port=ML_SERVER_PORT,
+        workers=1,
+        loop='auto'
+    )
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,38 @@
+#!/usr/bin/env bash
+# VTU EduMate ML Server launcher
+# Runs models/ml_server.py on mimalloc (or jemalloc) with PYTHONMALLOC=malloc,
+# so pymalloc's arenas are bypassed and every short-lived numpy/scipy object
+# goes through the faster, less fragmenting allocator.
+#
+# ML_ALLOCATOR_LIB: explicit allocator library to preload (optional)
+# LD_PRELOAD already set in the environment is left untouched.
+set -euo pipefail
+MODELS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+find_allocator() {
+  for lib in libmimalloc.so.2 libmimalloc.so libjemalloc.so.2 libjemalloc.so; do
+    path=$(ldconfig -p 2>/dev/null | awk -v lib="$lib" '$1 == lib { print $NF; exit }')
+    if [ -n "$path" ]; then
+      echo "$path"
+      return
+    fi
+  done
+}
+
+if [ -z "${LD_PRELOAD:-}" ]; then
+  allocator="${ML_ALLOCATOR_LIB:-$(find_allocator)}"
+  if [ -n "$allocator" ]; then
+    export LD_PRELOAD="$allocator"
+    echo "✅ Using allocator: $allocator"
+  else
+    echo "⚠️ mimalloc/jemalloc not found, using the system allocator"
+  fi
+fi
+
+export PYTHONMALLOC=malloc
+
+if command -v python3 &> /dev/null; then
+  exec python3 "$MODELS_DIR/ml_server.py"
+else
+  exec python "$MODELS_DIR/ml_server.py"
+fi
@@ -10,12 +10,17 @@ Requirements:
 
 Usage:
     python scripts/faiss_helper.py build --input rag_index/embeddings.json --output rag_index/faiss.index
+    python scripts/faiss_helper.py export --input rag_index/embeddings.json --embeddings-npy rag_index/embeddings.npy
+    python scripts/faiss_helper.py build --input rag_index/embeddings.npy --output rag_index/faiss.index
     python scripts/faiss_helper.py query --index rag_index/faiss.index --query-vector query.json --k 5
     python scripts/faiss_helper.py --serve  # Start as HTTP server (optional)
 
 Environment Variables:
-    FAISS_INDEX_TYPE: IndexFlatIP (default), IndexHNSWFlat, IndexIVFFlat
+    FAISS_INDEX_TYPE: IndexHNSWFlat (default), IndexHNSWSQ (8-bit scalar quantized), IndexFlatIP, IndexIVFFlat
     FAISS_DIMENSION: 768 (default, matches Gemini text-embedding-004)
+    FAISS_HNSW_EF_CONSTRUCTION: 200 (default)
+    FAISS_HNSW_EF_SEARCH: 64 (default)
+    FAISS_MMAP: 1 (default) memory-maps indices read-only on load; 0 reads them into RAM
 """
 
 import argparse
@@ -32,35 +37,96 @@ except ImportError:
     sys.exit(1)
 
 # Configuration
-FAISS_INDEX_TYPE = os.getenv('FAISS_INDEX_TYPE', 'IndexFlatIP')  # Inner Product (cosine for normalized vectors)
+FAISS_INDEX_TYPE = os.getenv('FAISS_INDEX_TYPE', 'IndexHNSWFlat')  # Graph search, log-N queries
 FAISS_DIMENSION = int(os.getenv('FAISS_DIMENSION', '768'))
+FAISS_HNSW_M = 32
+FAISS_HNSW_EF_CONSTRUCTION = int(os.getenv('FAISS_HNSW_EF_CONSTRUCTION', '200'))
+FAISS_HNSW_EF_SEARCH = int(os.getenv('FAISS_HNSW_EF_SEARCH', '64'))
+FAISS_MMAP = os.getenv('FAISS_MMAP', '1') == '1'
+
+# Index types scored by inner product on L2-normalized vectors (cosine similarity)
+COSINE_INDEX_TYPES = {'IndexFlatIP', 'IndexHNSWFlat', 'IndexHNSWSQ'}
+
+def _metadata_path(index_path):
+    """Metadata JSON stored next to an index (index.faiss -> index_metadata.json)"""
+    return str(Path(index_path).with_suffix('')) + '_metadata.json'
+
+def _chunks_path(npy_path):
+    """Chunk metadata (.jsonl) stored next to an exported .npy embeddings matrix"""
+    return str(Path(npy_path).with_suffix('.jsonl'))
 
 class FAISSHelper:
     def __init__(self, dimension=FAISS_DIMENSION):
         self.dimension = dimension
         self.index = None
         self.metadata = None
+        
+        # Let brute-force/IVF scans and batch adds use every core
+        faiss.omp_set_num_threads(os.cpu_count() or 1)
     
-    def build_index(self, embeddings_path, output_path, index_type=FAISS_INDEX_TYPE):
-        """Build FAISS index from embeddings JSON file"""
-        print(f"🔨 Building FAISS {index_type} index...")
+    def export_embeddings(self, embeddings_path, npy_path):
+        """Split embeddings JSON into a float32 .npy matrix and a .jsonl file of chunks"""
+        with open(embeddings_path, 'r') as f:
+            data = json.load(f)
+        
+        chunks = data['chunks']
+        embeddings = np.array([chunk['embedding'] for chunk in chunks], dtype=np.float32)
+        np.save(npy_path, embeddings)
+        
+        chunks_path = _chunks_path(npy_path)
+        with open(chunks_path, 'w') as f:
+            for chunk in chunks:
+                f.write(json.dumps({'id': chunk['id'], 'metadata': chunk['metadata'], 'text': chunk['text']}) + '\n')
+        
+        print(f"✅ Exported {len(chunks)} embeddings")
+        print(f"📁 Embeddings saved to: {npy_path}")
+        print(f"📄 Chunks saved to: {chunks_path}")
+    
+    def _load_embeddings(self, embeddings_path):
+        """Load chunks and float32 embeddings from embeddings JSON or a .npy/.jsonl pair"""
+        if embeddings_path.endswith('.npy'):
+            # Copy-on-write memory map: no text parsing, and pages are only
+            # copied if normalize_L2 writes to them
+            embeddings = np.ascontiguousarray(np.load(embeddings_path, mmap_mode='c'), dtype=np.float32)
+            
+            with open(_chunks_path(embeddings_path), 'r') as f:
+                chunks = [json.loads(line) for line in f if line.strip()]
+            
+            return chunks, embeddings
         
-        # Load embeddings and metadata
         with open(embeddings_path, 'r') as f:
             data = json.load(f)
         
         chunks = data['chunks']
         embeddings = np.array([chunk['embedding'] for chunk in chunks], dtype=np.float32)
+        return chunks, embeddings
+    
+    def build_index(self, embeddings_path, output_path, index_type=FAISS_INDEX_TYPE):
+        """Build FAISS index from embeddings JSON file or exported .npy embeddings"""
+        print(f"🔨 Building FAISS {index_type} index...")
         
-        # Normalize embeddings for cosine similarity (if using IndexFlatIP)
-        if index_type == 'IndexFlatIP':
+        # Load embeddings and metadata
+        chunks, embeddings = self._load_embeddings(embeddings_path)
+        
+        # Normalize embeddings for cosine similarity
+        if index_type in COSINE_INDEX_TYPES:
             faiss.normalize_L2(embeddings)
         
         # Create index
         if index_type == 'IndexFlatIP':
             self.index = faiss.IndexFlatIP(self.dimension)
         elif index_type == 'IndexHNSWFlat':
-            self.index = faiss.IndexHNSWFlat(self.dimension, 32)  # 32 = M parameter
+            self.index = faiss.IndexHNSWFlat(self.dimension, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+            self.index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+        elif index_type == 'IndexHNSWSQ':
+            # HNSW graph over 8-bit scalar-quantized vectors (4x smaller than float32)
+            self.index = faiss.IndexHNSWSQ(
+                self.dimension, faiss.ScalarQuantizer.QT_8bit, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+            self.index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+            self.index.train(embeddings)  # Learns per-dimension value ranges
         elif index_type == 'IndexIVFFlat':
             # IVF requires training
             nlist = min(100, max(1, len(embeddings) // 10))  # Number of clusters
@@ -85,7 +151,7 @@ class FAISSHelper:
             'count': len(chunks)
         }
         
-        metadata_path = output_path.replace('.index', '_metadata.json')
+        metadata_path = _metadata_path(output_path)
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
         
@@ -94,24 +160,38 @@ class FAISSHelper:
         print(f"📄 Metadata saved to: {metadata_path}")
     
     def load_index(self, index_path):
-        """Load FAISS index and metadata"""
-        self.index = faiss.read_index(index_path)
+        """Load FAISS index and metadata
+        
+        With FAISS_MMAP the index is memory-mapped read-only, so worker processes
+        serving the same file share its pages through the OS page cache (for
+        faiss-cpu 1.7.x this covers IVF inverted lists; other index types are
+        still read into memory). A mapped index is never updated in place:
+        restart the workers after rebuilding it.
+        """
+        io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if FAISS_MMAP else 0
+        self.index = faiss.read_index(index_path, io_flags)
+        if hasattr(self.index, 'hnsw'):
+            self.index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
         
-        metadata_path = index_path.replace('.index', '_metadata.json')
+        metadata_path = _metadata_path(index_path)
         with open(metadata_path, 'r') as f:
             self.metadata = json.load(f)
         
         print(f"📖 Loaded FAISS index: {self.metadata['count']} vectors")
     
     def query(self, query_vector, k=5):
-        """Query FAISS index with vector"""
+        """Query FAISS index with vector
+        
+        A contiguous float32 ndarray is used without copying (and is
+        normalized in place for cosine index types); lists are converted once.
+        """
         if self.index is None:
             raise ValueError("Index not loaded")
         
-        query_array = np.array([query_vector], dtype=np.float32)
+        query_array = np.asarray(query_vector, dtype=np.float32).reshape(1, self.index.d)
         
         # Normalize query vector for cosine similarity
-        if self.metadata.get('index_type') == 'IndexFlatIP':
+        if self.metadata.get('index_type') in COSINE_INDEX_TYPES:
             faiss.normalize_L2(query_array)
         
         # Search
@@ -135,9 +215,15 @@ def main():
     
     # Build command
     build_parser = subparsers.add_parser('build', help='Build FAISS index')
-    build_parser.add_argument('--input', required=True, help='Input embeddings JSON file')
+    build_parser.add_argument('--input', required=True, help='Input embeddings JSON file or exported .npy')
     build_parser.add_argument('--output', required=True, help='Output FAISS index file')
-    build_parser.add_argument('--type', default=FAISS_INDEX_TYPE, help='Index type')
+    build_parser.add_argument('--type', default=FAISS_INDEX_TYPE,
+                              help='Index type: IndexHNSWFlat, IndexHNSWSQ, IndexFlatIP, IndexIVFFlat')
+    
+    # Export command
+    export_parser = subparsers.add_parser('export', help='Export embeddings JSON to .npy + .jsonl')
+    export_parser.add_argument('--input', required=True, help='Input embeddings JSON file')
+    export_parser.add_argument('--embeddings-npy', required=True, help='Output .npy embeddings file')
     
     # Query command
     query_parser = subparsers.add_parser('query', help='Query FAISS index')
@@ -156,6 +242,10 @@ def main():
         helper = FAISSHelper()
         helper.build_index(args.input, args.output, args.type)
     
+    elif args.command == 'export':
+        helper = FAISSHelper()
+        helper.export_embeddings(args.input, args.embeddings_npy)
+    
     elif args.command == 'query':
         helper = FAISSHelper()
         helper.load_index(args.index)